@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+import contextlib
+import os
+import pickle
+import tempfile
+from pathlib import Path
+from typing import Any, Optional
+
+
+def read_cache(cache_path: Path, source: Any) -> Optional[Any]:
+    # ``source`` identifies the inputs (stat fields, file names) the cache was
+    # built from; anything but an exact match is a miss, since copy and deploy
+    # tools often preserve older mtimes on replaced files.
+    #
+    # pickle.load can run arbitrary code, and it does so before the source check
+    # below: these caches must live in directories only the app's own user can
+    # write, the same trust already placed in the config and content files.
+    try:
+        with cache_path.open("rb") as handle:
+            payload = pickle.load(handle)
+    except Exception:  # unreadable, truncated, foreign or newer-protocol pickle
+        return None
+    if not isinstance(payload, dict) or payload.get("source") != source:
+        return None
+    return payload.get("value")
+
+
+def write_cache(cache_path: Path, source: Any, value: Any) -> None:
+    # Each writer gets its own temp file, so workers racing on a cold cache
+    # never write into a file another one is about to rename into place.
+    try:
+        handle = tempfile.NamedTemporaryFile(
+            dir=cache_path.parent, prefix=cache_path.name + ".", suffix=".tmp", delete=False
+        )
+    except OSError:
+        return
+    try:
+        with handle:
+            pickle.dump({"source": source, "value": value}, handle, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(handle.name, cache_path)
+    except OSError:
+        with contextlib.suppress(OSError):
+            os.unlink(handle.name)
@@ -1,14 +1,29 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Callable, Dict
 
 import yaml
 
+from .cache import read_cache, write_cache
+
+try:
+    from yaml import CSafeLoader as _Loader
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeLoader as _Loader  # type: ignore[assignment]
+
 
 @dataclass(frozen=True)
 class ConfigBundle:
+    """Parsed config files.
+
+    ``load_config`` memoizes one bundle per root, so every caller shares these
+    dicts; ``frozen`` only stops rebinding the fields. Treat the contents as
+    read-only and copy before changing anything.
+    """
+
     run: Dict[str, Any]
     resources: Dict[str, Any]
     caps: Dict[str, Any]
@@ -16,15 +31,33 @@ class ConfigBundle:
 
 
 def load_yaml(path: Path) -> Dict[str, Any]:
-    if not path.exists():
+    try:
+        text = path.read_text(encoding="utf-8")
+    except FileNotFoundError:
         return {}
-    return yaml.safe_load(path.read_text(encoding="utf-8")) or {}
+    return yaml.load(text, Loader=_Loader) or {}
+
+
+def _load_cached(path: Path, parser: Callable[[Path], Dict[str, Any]]) -> Dict[str, Any]:
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return parser(path)
+    source = (stat.st_mtime_ns, stat.st_size)
+    cache_path = path.with_suffix(path.suffix + ".pkl")
+    cached = read_cache(cache_path, source)
+    if cached is not None:
+        return cached
+    value = parser(path)
+    write_cache(cache_path, source, value)
+    return value
 
 
+@lru_cache(maxsize=None)
 def load_config(root: Path) -> ConfigBundle:
-    return ConfigBundle(
-        run=load_yaml(root / "config" / "run.yaml"),
-        resources=load_yaml(root / "config" / "resources.yaml"),
-        caps=load_yaml(root / "config" / "caps.yaml"),
-        pity=load_yaml(root / "config" / "pity.yaml"),
+    config_dir = root / "config"
+    run, resources, caps, pity = (
+        _load_cached(config_dir / name, load_yaml)
+        for name in ("run.yaml", "resources.yaml", "caps.yaml", "pity.yaml")
     )
+    return ConfigBundle(run=run, resources=resources, caps=caps, pity=pity)
@@ -1,29 +1,145 @@
 from __future__ import annotations
 
-import json
+import os
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+import orjson
+
+from .cache import read_cache, write_cache
+
+_MAX_WORKERS = 8
+
+
+class HookCompiled(NamedTuple):
+    raw: Dict[str, Any]
+    hook_id: str
+    kind: str
+    location: Optional[str]
+    time_slot: Optional[str]
+    min_day: Optional[int]
+    max_day: Optional[int]
+    base_weight: float
+    p0: float
+    dp: float
+    p_max: float
+    cooldown_days: int
+    payload_template: Dict[str, Any]
+
+
+def compile_hook(raw: Dict[str, Any]) -> HookCompiled:
+    conditions = raw.get("conditions", {}) or {}
+    return HookCompiled(
+        raw=raw,
+        hook_id=raw.get("hook_id", "hook"),
+        kind=raw.get("kind", "soft"),
+        location=conditions.get("location") or None,
+        time_slot=conditions.get("time_slot") or None,
+        min_day=conditions.get("min_day") or None,
+        max_day=conditions.get("max_day") or None,
+        base_weight=raw.get("base_weight", 1.0),
+        p0=raw.get("p0", 0.2),
+        dp=raw.get("dp", 0.1),
+        p_max=raw.get("p_max", 0.7),
+        cooldown_days=raw.get("cooldown_days", 1),
+        payload_template=raw.get("payload_template", {}),
+    )
+
+
+class EventBucket(NamedTuple):
+    events: List[Dict[str, Any]]
+    cumulative: List[float]
+    total: float
+    positions: Dict[str, List[int]]
+
+
+def build_event_bucket(events: List[Dict[str, Any]]) -> EventBucket:
+    cumulative: List[float] = []
+    total = 0.0
+    positions: Dict[str, List[int]] = {}
+    for index, event in enumerate(events):
+        total += event.get("base_weight", 1.0)
+        cumulative.append(total)
+        event_id = event.get("event_id")
+        if event_id:
+            positions.setdefault(event_id, []).append(index)
+    return EventBucket(events=events, cumulative=cumulative, total=total, positions=positions)
+
+
+def index_events_by_slot(events: List[Dict[str, Any]]) -> Dict[Tuple[str, str], EventBucket]:
+    grouped: Dict[Tuple[str, str], List[Dict[str, Any]]] = {}
+    for event in events:
+        grouped.setdefault((event.get("location"), event.get("time_slot")), []).append(event)
+    return {slot: build_event_bucket(events) for slot, events in grouped.items()}
+
+
+def index_hooks_by_location(hooks: List[Dict[str, Any]]) -> Dict[Optional[str], List[HookCompiled]]:
+    # Each bucket holds the hooks for that location plus the location-free
+    # ones, in load order; the None bucket serves every other location.
+    compiled = [compile_hook(hook) for hook in hooks]
+    index: Dict[Optional[str], List[HookCompiled]] = {None: [hook for hook in compiled if hook.location is None]}
+    for location in {hook.location for hook in compiled if hook.location is not None}:
+        index[location] = [hook for hook in compiled if hook.location in (None, location)]
+    return index
 
 
 @dataclass(frozen=True)
 class ContentBundle:
+    """Loaded content files and the lookup indexes built from them.
+
+    ``load_content`` memoizes one bundle per root and the orchestrator hands the
+    raw event and hook dicts around, so they are shared by every session and
+    must never be mutated.
+    """
+
     events: List[Dict[str, Any]]
     hooks: List[Dict[str, Any]]
     endings: List[Dict[str, Any]]
+    events_by_slot: Dict[Tuple[str, str], EventBucket]
+    hooks_by_location: Dict[Optional[str], List[HookCompiled]]
+
+    def hooks_for(self, location: Optional[str]) -> List[HookCompiled]:
+        return self.hooks_by_location.get(location, self.hooks_by_location[None])
+
+
+def _read_json(path: Path) -> Dict[str, Any]:
+    return orjson.loads(path.read_bytes())
 
 
 def load_json_files(directory: Path) -> List[Dict[str, Any]]:
-    if not directory.exists():
+    # (name, st_mtime_ns, st_size) per file identifies the cached bundle.
+    files: List[Tuple[str, int, int]] = []
+    try:
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if entry.name.endswith(".json") and entry.is_file():
+                    stat = entry.stat()
+                    files.append((entry.name, stat.st_mtime_ns, stat.st_size))
+    except FileNotFoundError:
         return []
-    items: List[Dict[str, Any]] = []
-    for path in sorted(directory.glob("*.json")):
-        items.append(json.loads(path.read_text(encoding="utf-8")))
+    files.sort()
+    cache_path = directory / ".bundle.pkl"
+    cached = read_cache(cache_path, files)
+    if cached is not None:
+        return cached
+    with ThreadPoolExecutor(max_workers=_MAX_WORKERS) as executor:
+        items: List[Dict[str, Any]] = list(executor.map(_read_json, [directory / name for name, _, _ in files]))
+    write_cache(cache_path, files, items)
     return items
 
 
+@lru_cache(maxsize=None)
 def load_content(root: Path) -> ContentBundle:
-    events = load_json_files(root / "content" / "events")
-    hooks = load_json_files(root / "content" / "hooks")
-    endings = load_json_files(root / "content" / "endings")
-    return ContentBundle(events=events, hooks=hooks, endings=endings)
+    directories = [root / "content" / name for name in ("events", "hooks", "endings")]
+    with ThreadPoolExecutor(max_workers=len(directories)) as executor:
+        events, hooks, endings = executor.map(load_json_files, directories)
+    return ContentBundle(
+        events=events,
+        hooks=hooks,
+        endings=endings,
+        events_by_slot=index_events_by_slot(events),
+        hooks_by_location=index_hooks_by_location(hooks),
+    )
@@ -1,8 +1,11 @@
 from __future__ import annotations
 
 from pathlib import Path
+from typing import Any
 
+import orjson
 from fastapi import FastAPI, HTTPException
+from fastapi.responses import JSONResponse
 from pydantic import BaseModel
 
 from .config import load_config
@@ -16,9 +19,22 @@ from .orchestrator import (
     day_end,
     day_start,
 )
+from .serializer import serialize_api_response
 from .storage import InMemoryStore
 
-app = FastAPI(title="Forgotten Girl Orchestrator")
+
+class FastJSONResponse(JSONResponse):
+    # API responses go through the generated serializer and other models through
+    # pydantic-core; neither uses jsonable_encoder or the stdlib json module.
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, ApiResponse):
+            content = serialize_api_response(content)
+        elif isinstance(content, BaseModel):
+            return content.model_dump_json().encode("utf-8")
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+
+
+app = FastAPI(title="Forgotten Girl Orchestrator", default_response_class=FastJSONResponse)
 root_path = Path(__file__).resolve().parent.parent
 config = load_config(root_path)
 content = load_content(root_path)
@@ -41,56 +57,57 @@ class SessionRequest(BaseModel):
 
 
 @app.post("/api/session/new", response_model=ApiResponse)
-def new_session() -> ApiResponse:
+async def new_session() -> FastJSONResponse:
     state = create_initial_state(config)
     store.save(state)
     messages = [Message(role="system", content="新的旅程开始。", kind="session_start")]
-    return build_response(state, messages, [])
+    return FastJSONResponse(build_response(state, messages, []))
 
 
 @app.get("/api/state", response_model=ApiResponse)
-def get_state(session_id: str) -> ApiResponse:
-    if not store.exists(session_id):
-        raise HTTPException(status_code=404, detail="Session not found")
-    state = store.get(session_id)
-    return build_response(state, [], [])
+async def get_state(session_id: str) -> FastJSONResponse:
+    async with store.lock(session_id):
+        if not store.exists(session_id):
+            raise HTTPException(status_code=404, detail="Session not found")
+        state = store.get(session_id)
+        return FastJSONResponse(build_response(state, [], []))
 
 
 @app.post("/api/day/start", response_model=ApiResponse)
-def api_day_start(request: SessionRequest) -> ApiResponse:
-    if not store.exists(request.session_id):
-        raise HTTPException(status_code=404, detail="Session not found")
-    state = store.get(request.session_id)
-    messages = day_start(state, config)
-    store.save(state)
-    return build_response(state, messages, [])
+async def api_day_start(request: SessionRequest) -> FastJSONResponse:
+    async with store.lock(request.session_id):
+        if not store.exists(request.session_id):
+            raise HTTPException(status_code=404, detail="Session not found")
+        state = store.get(request.session_id)
+        messages = day_start(state, config)
+        return FastJSONResponse(build_response(state, messages, []))
 
 
 @app.post("/api/action/select", response_model=ApiResponse)
-def api_action_select(request: ActionRequest) -> ApiResponse:
-    if not store.exists(request.session_id):
-        raise HTTPException(status_code=404, detail="Session not found")
-    state = store.get(request.session_id)
-    messages, ui_hints = action_select(state, content, request.location, request.time_slot)
-    store.save(state)
-    return build_response(state, messages, ui_hints)
+async def api_action_select(request: ActionRequest) -> FastJSONResponse:
+    async with store.lock(request.session_id):
+        if not store.exists(request.session_id):
+            raise HTTPException(status_code=404, detail="Session not found")
+        state = store.get(request.session_id)
+        messages, ui_hints = action_select(state, content, request.location, request.time_slot)
+        return FastJSONResponse(build_response(state, messages, ui_hints))
 
 
 @app.post("/api/chat", response_model=ApiResponse)
-def api_chat(request: ChatRequest) -> ApiResponse:
-    if not store.exists(request.session_id):
-        raise HTTPException(status_code=404, detail="Session not found")
-    state = store.get(request.session_id)
-    messages = chat(state, request.text, content)
-    store.save(state)
-    return build_response(state, messages, [])
+async def api_chat(request: ChatRequest) -> FastJSONResponse:
+    async with store.lock(request.session_id):
+        if not store.exists(request.session_id):
+            raise HTTPException(status_code=404, detail="Session not found")
+        state = store.get(request.session_id)
+        messages = chat(state, request.text, content)
+        return FastJSONResponse(build_response(state, messages, []))
 
 
 @app.post("/api/day/end", response_model=ApiResponse)
-def api_day_end(request: SessionRequest) -> ApiResponse:
-    if not store.exists(request.session_id):
-        raise HTTPException(status_code=404, detail="Session not found")
-    state = store.get(request.session_id)
-    messages = day_end(state, config, content)
-    store.save(state)
-    return build_response(state, messages, [])
+async def api_day_end(request: SessionRequest) -> FastJSONResponse:
+    async with store.lock(request.session_id):
+        if not store.exists(request.session_id):
+            raise HTTPException(status_code=404, detail="Session not found")
+        state = store.get(request.session_id)
+        messages = day_end(state, config, content)
+        return FastJSONResponse(build_response(state, messages, []))
@@ -1,9 +1,13 @@
 from __future__ import annotations
 
+from collections import deque
+from dataclasses import dataclass, field
 from enum import Enum
-from typing import Any, Dict, List, Optional
+from typing import Any, Deque, Dict, List, Optional, Tuple
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr, field_validator
+
+TRACE_LOG_LIMIT = 200
 
 
 class GamePhase(str, Enum):
@@ -13,7 +17,10 @@ class GamePhase(str, Enum):
     ENDED = "ENDED"
 
 
-class TriggerState(BaseModel):
+# Internal value types created on the hot path are plain slotted dataclasses;
+# pydantic still validates and serializes them as fields of the models below.
+@dataclass(slots=True)
+class TriggerState:
     exposures: int = 0
     p0: float = 0.2
     dp: float = 0.15
@@ -23,10 +30,11 @@ class TriggerState(BaseModel):
     cooldown_until_day: int = 0
 
 
-class Trigger(BaseModel):
+@dataclass(slots=True)
+class Trigger:
     kind: str
     value: str
-    meta: Dict[str, Any] = Field(default_factory=dict)
+    meta: Dict[str, Any] = field(default_factory=dict)
 
 
 class Fragment(BaseModel):
@@ -46,7 +54,8 @@ class Fragment(BaseModel):
     meta: Dict[str, Any] = Field(default_factory=dict)
 
 
-class FragmentCandidate(BaseModel):
+@dataclass(slots=True)
+class FragmentCandidate:
     anchor: str
     emotion_tag: str
     score: float
@@ -85,11 +94,12 @@ class CurrentContext(BaseModel):
     stage_id: Optional[str] = None
 
 
-class Message(BaseModel):
+@dataclass(slots=True)
+class Message:
     role: str
     content: str
     kind: str
-    options: List[str] = Field(default_factory=list)
+    options: List[str] = field(default_factory=list)
 
 
 class GameState(BaseModel):
@@ -114,10 +124,20 @@ class GameState(BaseModel):
     meta_progress: Dict[str, Any] = Field(default_factory=dict)
     inventory: Dict[str, int] = Field(default_factory=dict)
     history_refs: Dict[str, Any] = Field(default_factory=dict)
-    trace_log: List[Dict[str, Any]] = Field(default_factory=list)
+    # Only the most recent entries are kept so responses stay a bounded size.
+    trace_log: Deque[Dict[str, Any]] = Field(default_factory=lambda: deque(maxlen=TRACE_LOG_LIMIT))
     daily_fragment_count: int = 0
     daily_proactive_count: int = 0
     event_history: List[str] = Field(default_factory=list)
+    # Hooks whose conditions match a (location, time_slot, day_index); not serialized.
+    _hook_match_cache: Dict[Tuple[Optional[str], Optional[str], int], List[Any]] = PrivateAttr(default_factory=dict)
+
+    @field_validator("trace_log")
+    @classmethod
+    def _bound_trace_log(cls, value: Deque[Dict[str, Any]]) -> Deque[Dict[str, Any]]:
+        if value.maxlen == TRACE_LOG_LIMIT:
+            return value
+        return deque(value, maxlen=TRACE_LOG_LIMIT)
 
 
 class ApiResponse(BaseModel):
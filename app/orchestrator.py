@@ -1,12 +1,15 @@
 from __future__ import annotations
 
 import hashlib
-import uuid
+import os
+import threading
+from bisect import bisect_left
 from dataclasses import dataclass
+from functools import lru_cache
 from typing import Any, Dict, List, Optional, Tuple
 
 from .config import ConfigBundle
-from .content import ContentBundle
+from .content import ContentBundle, HookCompiled
 from .models import (
     ApiResponse,
     Caps,
@@ -23,6 +26,28 @@ from .models import (
 )
 
 
+_UUID_BATCH_BYTES = 1024
+_uuid_buffer = bytearray()
+_uuid_lock = threading.Lock()
+# A forked worker must not hand out the ids left in its parent's buffer; the
+# hook only exists where os.fork does.
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_uuid_buffer.clear)
+
+
+def fast_uuid4() -> str:
+    with _uuid_lock:
+        if len(_uuid_buffer) < 16:
+            _uuid_buffer.extend(os.urandom(_UUID_BATCH_BYTES))
+        raw = _uuid_buffer[:16]
+        del _uuid_buffer[:16]
+    # Same layout as uuid.uuid4(): version 4, RFC 4122 variant.
+    raw[6] = (raw[6] & 0x0F) | 0x40
+    raw[8] = (raw[8] & 0x3F) | 0x80
+    digits = raw.hex()
+    return f"{digits[:8]}-{digits[8:12]}-{digits[12:16]}-{digits[16:20]}-{digits[20:]}"
+
+
 @dataclass
 class RollResult:
     success: bool
@@ -30,37 +55,22 @@ class RollResult:
     probability: float
 
 
+@lru_cache(maxsize=4096, typed=True)
 def stable_seed(*parts: Any) -> int:
     raw = "|".join(str(part) for part in parts)
-    digest = hashlib.sha256(raw.encode("utf-8")).hexdigest()
-    return int(digest[:16], 16)
+    digest = hashlib.blake2b(raw.encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "big")
 
 
 def roll_with_pity(p0: float, dp: float, p_max: float, exposures: int, seed: int) -> RollResult:
     probability = min(p_max, p0 + exposures * dp)
-    rng = hashlib.sha256(str(seed).encode("utf-8")).digest()
-    roll = int.from_bytes(rng[:8], "big") / 2**64
+    # Seeds come from stable_seed and are already uniform over 64 bits.
+    roll = (seed % 2**64) / 2**64
     return RollResult(success=roll <= probability, roll=roll, probability=probability)
 
 
-def select_weighted(items: List[Dict[str, Any]], seed: int) -> Optional[Dict[str, Any]]:
-    if not items:
-        return None
-    total = sum(item.get("base_weight", 1.0) for item in items)
-    if total <= 0:
-        return items[0]
-    rng_value = (seed % 10_000) / 10_000
-    threshold = rng_value * total
-    cumulative = 0.0
-    for item in items:
-        cumulative += item.get("base_weight", 1.0)
-        if cumulative >= threshold:
-            return item
-    return items[-1]
-
-
 def create_initial_state(config: ConfigBundle) -> GameState:
-    session_id = str(uuid.uuid4())
+    session_id = fast_uuid4()
     resources = Resources(**config.resources)
     caps = Caps(**config.caps)
     return GameState(
@@ -77,6 +87,7 @@ def day_start(state: GameState, config: ConfigBundle) -> List[Message]:
     state.daily_fragment_count = 0
     state.daily_proactive_count = 0
     state.current_context = CurrentContext()
+    state._hook_match_cache.clear()
     return [Message(role="system", content=f"第{state.day_index}天开始。", kind="day_start")]
 
 
@@ -155,6 +166,7 @@ def day_end(state: GameState, config: ConfigBundle, content: ContentBundle) -> L
     state.fragment_candidates_today.clear()
     state.current_context = CurrentContext()
     state.day_index += 1
+    state._hook_match_cache.clear()
 
     if state.day_index > int(config.run.get("days_per_run", 7)):
         state.game_phase = GamePhase.RUN_END
@@ -281,21 +293,26 @@ def proactive_check(state: GameState, content: ContentBundle, stage_id: str) ->
         return []
     if state.resources.npc_initiative <= 0:
         return []
+    context = state.current_context
+    cache_key = (context.location, context.time_slot, state.day_index)
+    matching = state._hook_match_cache.get(cache_key)
+    if matching is None:
+        matching = [hook for hook in content.hooks_for(context.location) if hook_matches_conditions(hook, state)]
+        state._hook_match_cache[cache_key] = matching
     eligible = [
         hook
-        for hook in content.hooks
-        if hook_matches_conditions(hook, state)
-        and state.proactive_state.hook_cooldowns.get(hook.get("hook_id", ""), 0) <= state.day_index
+        for hook in matching
+        if state.proactive_state.hook_cooldowns.get(hook.hook_id, 0) <= state.day_index
     ]
     if not eligible:
         return []
     hook = select_hook(eligible, state, stage_id)
     if hook is None:
         return []
-    hook_id = hook.get("hook_id", "hook")
+    hook_id = hook.hook_id
     exposures = state.proactive_state.hook_exposures.get(hook_id, 0)
     seed = stable_seed(state.session_id, state.run_index, state.day_index, stage_id, hook_id)
-    result = roll_with_pity(hook.get("p0", 0.2), hook.get("dp", 0.1), hook.get("p_max", 0.7), exposures, seed)
+    result = roll_with_pity(hook.p0, hook.dp, hook.p_max, exposures, seed)
     state.trace_log.append(
         {
             "kind": "proactive_roll",
@@ -311,43 +328,37 @@ def proactive_check(state: GameState, content: ContentBundle, stage_id: str) ->
         state.proactive_state.hook_exposures[hook_id] = exposures + 1
         return []
     state.proactive_state.hook_exposures[hook_id] = 0
-    state.proactive_state.hook_cooldowns[hook_id] = state.day_index + hook.get("cooldown_days", 1)
+    state.proactive_state.hook_cooldowns[hook_id] = state.day_index + hook.cooldown_days
     state.resources.npc_initiative -= 1
     state.daily_proactive_count += 1
-    payload = hook.get("payload_template", {})
+    payload = hook.payload_template
     message = Message(
         role="npc",
         content=payload.get("text", "她似乎想主动说点什么。"),
-        kind=f"proactive_{hook.get('kind', 'soft')}",
+        kind=f"proactive_{hook.kind}",
         options=payload.get("options", []),
     )
     state.pending_npc_messages.append(message)
     return []
 
 
-def hook_matches_conditions(hook: Dict[str, Any], state: GameState) -> bool:
-    conditions = hook.get("conditions", {}) or {}
-    location = conditions.get("location")
-    time_slot = conditions.get("time_slot")
-    min_day = conditions.get("min_day")
-    max_day = conditions.get("max_day")
-    if location and location != state.current_context.location:
+def hook_matches_conditions(hook: HookCompiled, state: GameState) -> bool:
+    if hook.location is not None and hook.location != state.current_context.location:
         return False
-    if time_slot and time_slot != state.current_context.time_slot:
+    if hook.time_slot is not None and hook.time_slot != state.current_context.time_slot:
         return False
-    if min_day and state.day_index < min_day:
+    if hook.min_day is not None and state.day_index < hook.min_day:
         return False
-    if max_day and state.day_index > max_day:
+    if hook.max_day is not None and state.day_index > hook.max_day:
         return False
     return True
 
 
-def select_hook(eligible: List[Dict[str, Any]], state: GameState, stage_id: str) -> Optional[Dict[str, Any]]:
-    weighted: List[Tuple[Dict[str, Any], float]] = []
+def select_hook(eligible: List[HookCompiled], state: GameState, stage_id: str) -> Optional[HookCompiled]:
+    weighted: List[Tuple[HookCompiled, float]] = []
     for hook in eligible:
-        hook_id = hook.get("hook_id", "")
-        exposure = state.proactive_state.hook_exposures.get(hook_id, 0)
-        weight = hook.get("base_weight", 1.0) + exposure * 0.2
+        exposure = state.proactive_state.hook_exposures.get(hook.hook_id, 0)
+        weight = hook.base_weight + exposure * 0.2
         weighted.append((hook, max(weight, 0.1)))
     total = sum(weight for _, weight in weighted)
     if total <= 0:
@@ -364,26 +375,32 @@ def select_hook(eligible: List[Dict[str, Any]], state: GameState, stage_id: str)
 
 
 def select_event(content: ContentBundle, location: str, time_slot: str, state: GameState) -> Optional[Dict[str, Any]]:
-    candidates = [
-        event
-        for event in content.events
-        if event.get("location") == location and event.get("time_slot") == time_slot
-    ]
-    weighted: List[Dict[str, Any]] = []
+    bucket = content.events_by_slot.get((location, time_slot))
+    if bucket is None:
+        return None
+    # Repeating the previous event halves the weight of every candidate with its
+    # id; past each such position the running totals drop by the penalties so
+    # far, so each stretch between penalized positions is bisected on its own.
     last_event_id = state.event_history[-1] if state.event_history else None
-    for event in candidates:
-        weight = event.get("base_weight", 1.0)
-        if last_event_id and event.get("event_id") == last_event_id:
-            weight *= 0.5
-        adjusted = dict(event)
-        adjusted["base_weight"] = weight
-        weighted.append(adjusted)
+    penalized = bucket.positions.get(last_event_id, []) if last_event_id else []
+    penalties = [bucket.events[position].get("base_weight", 1.0) * 0.5 for position in penalized]
+    total = bucket.total - sum(penalties)
+    if total <= 0:
+        return bucket.events[0]
     seed = stable_seed(state.session_id, state.run_index, state.day_index, location, time_slot)
-    return select_weighted(weighted, seed)
+    threshold = (seed % 10_000) / 10_000 * total
+    start, shift = 0, 0.0
+    for position, penalty in zip(penalized, penalties):
+        index = bisect_left(bucket.cumulative, threshold + shift, lo=start, hi=position)
+        if index < position:
+            return bucket.events[index]
+        start, shift = position, shift + penalty
+    index = bisect_left(bucket.cumulative, threshold + shift, lo=start)
+    return bucket.events[min(index, len(bucket.events) - 1)]
 
 
 def build_response(state: GameState, messages: List[Message], ui_hints: List[str]) -> ApiResponse:
-    trace_id = str(uuid.uuid4())
+    trace_id = fast_uuid4()
     if state.pending_npc_messages:
         messages.extend(state.pending_npc_messages)
         state.pending_npc_messages.clear()
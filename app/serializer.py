@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import dataclasses
+import re
+import types
+from collections import deque
+from enum import Enum
+from typing import Any, Callable, Dict, List, Union, get_args, get_origin, get_type_hints
+
+from pydantic import BaseModel
+
+from .models import ApiResponse
+
+_PASSTHROUGH_TYPES = (str, int, float, bool, type(None))
+_NON_IDENTIFIER = re.compile(r"\W")
+
+
+def _field_types(cls: type) -> Dict[str, Any]:
+    if issubclass(cls, BaseModel):
+        _check_model_options(cls)
+        return {name: info.annotation for name, info in cls.model_fields.items()}
+    hints = get_type_hints(cls)
+    return {item.name: hints[item.name] for item in dataclasses.fields(cls)}
+
+
+def _check_model_options(cls: type) -> None:
+    # Anything that makes model_dump_json differ from "every field, by name".
+    decorators = cls.__pydantic_decorators__
+    if cls.model_computed_fields or decorators.field_serializers or decorators.model_serializers:
+        raise TypeError(f"{cls.__name__}: computed fields and custom serializers are not supported")
+    if cls.model_config.get("extra") == "allow":
+        raise TypeError(f"{cls.__name__}: extra='allow' is not supported")
+    for name, info in cls.model_fields.items():
+        if info.alias or info.serialization_alias or info.exclude:
+            raise TypeError(f"{cls.__name__}.{name}: aliases and excluded fields are not supported")
+
+
+def build_serializer(root: type) -> Callable[[Any], Dict[str, Any]]:
+    """Compile a function that turns ``root`` instances into orjson-ready dicts.
+
+    Values orjson encodes natively (strings, numbers, enums, plain containers)
+    are passed through; nested models get their own generated function. Any
+    annotation or field option without a known pydantic-equivalent encoding
+    raises ``TypeError`` here rather than producing different JSON later.
+    """
+    names: Dict[type, str] = {}
+    sources: List[str] = []
+
+    def convert(annotation: Any, value: str, depth: int) -> str:
+        origin = get_origin(annotation)
+        args = get_args(annotation)
+        if origin is Union or origin is types.UnionType:
+            members = [arg for arg in args if arg is not type(None)]
+            if len(members) != 1:
+                raise TypeError(f"unsupported union {annotation!r}")
+            inner = convert(members[0], value, depth)
+            return value if inner == value else f"(None if {value} is None else {inner})"
+        if origin in (list, deque) and len(args) == 1:
+            item = f"v{depth}"
+            inner = convert(args[0], item, depth + 1)
+            if inner == item and origin is list:
+                return value
+            return f"[{inner} for {item} in {value}]"
+        if origin is dict and len(args) == 2 and args[0] is str:
+            item = f"v{depth}"
+            inner = convert(args[1], item, depth + 1)
+            if inner == item:
+                return value
+            return f"{{k{depth}: {inner} for k{depth}, {item} in {value}.items()}}"
+        if origin is not None:
+            raise TypeError(f"unsupported annotation {annotation!r}")
+        if annotation is Any or annotation in _PASSTHROUGH_TYPES:
+            return value
+        if isinstance(annotation, type) and issubclass(annotation, Enum):
+            return value
+        if isinstance(annotation, type) and (issubclass(annotation, BaseModel) or dataclasses.is_dataclass(annotation)):
+            return f"{function_for(annotation)}({value})"
+        raise TypeError(f"unsupported annotation {annotation!r}")
+
+    def function_for(cls: type) -> str:
+        if cls not in names:
+            # Class names are not unique (nor always identifiers, e.g. generic
+            # models), so each function is numbered.
+            names[cls] = f"_serialize_{len(names)}_{_NON_IDENTIFIER.sub('_', cls.__name__)}"
+            fields = []
+            for name, annotation in _field_types(cls).items():
+                try:
+                    fields.append(f"{name!r}: {convert(annotation, 'obj.' + name, 0)}")
+                except TypeError as exc:
+                    raise TypeError(f"{cls.__name__}.{name}: {exc}") from None
+            sources.append(f"def {names[cls]}(obj):\n    return {{{', '.join(fields)}}}\n")
+        return names[cls]
+
+    entry = function_for(root)
+    namespace: Dict[str, Any] = {}
+    exec(compile("\n".join(sources), f"<serializer {root.__name__}>", "exec"), namespace)
+    return namespace[entry]
+
+
+serialize_api_response = build_serializer(ApiResponse)
@@ -1,19 +1,33 @@
 from __future__ import annotations
 
-from typing import Dict
+import asyncio
+from typing import Dict, List
 
 from .models import GameState
 
+_SHARD_COUNT = 16
+
 
 class InMemoryStore:
+    # Handlers mutate the stored GameState in place, so a session only needs
+    # saving once when it is created; later saves of the same object are no-ops.
+    # Sessions are spread over shards, each with a lock that callers hold while
+    # mutating a session so requests for it apply in order.
     def __init__(self) -> None:
-        self._store: Dict[str, GameState] = {}
+        self._shards: List[Dict[str, GameState]] = [{} for _ in range(_SHARD_COUNT)]
+        self._locks: List[asyncio.Lock] = [asyncio.Lock() for _ in range(_SHARD_COUNT)]
+
+    def _shard_index(self, session_id: str) -> int:
+        return hash(session_id) & (_SHARD_COUNT - 1)
 
     def get(self, session_id: str) -> GameState:
-        return self._store[session_id]
+        return self._shards[self._shard_index(session_id)][session_id]
 
     def save(self, state: GameState) -> None:
-        self._store[state.session_id] = state
+        self._shards[self._shard_index(state.session_id)].setdefault(state.session_id, state)
 
     def exists(self, session_id: str) -> bool:
-        return session_id in self._store
+        return session_id in self._shards[self._shard_index(session_id)]
+
+    def lock(self, session_id: str) -> asyncio.Lock:
+        return self._locks[self._shard_index(session_id)]
@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import os
+import shutil
+from pathlib import Path
+
+import pytest
+
+from app.config import _load_cached, load_yaml
+from app.content import load_json_files
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def _backdate(path: Path, seconds: int = 10) -> None:
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns - seconds * 10**9))
+
+
+@pytest.fixture
+def events_dir(tmp_path: Path) -> Path:
+    directory = tmp_path / "events"
+    shutil.copytree(ROOT / "content" / "events", directory)
+    return directory
+
+
+def _intros(directory: Path) -> list:
+    return [event["intro"] for event in load_json_files(directory)]
+
+
+def test_yaml_cache_is_written_and_reused(tmp_path: Path):
+    path = tmp_path / "resources.yaml"
+    path.write_text("ap: 2\n", encoding="utf-8")
+    assert _load_cached(path, load_yaml) == {"ap": 2}
+    assert (tmp_path / "resources.yaml.pkl").exists()
+    assert _load_cached(path, lambda _: pytest.fail("cache should have been used")) == {"ap": 2}
+
+
+def test_yaml_cache_sees_backdated_replacement(tmp_path: Path):
+    path = tmp_path / "resources.yaml"
+    path.write_text("ap: 2\n", encoding="utf-8")
+    _load_cached(path, load_yaml)
+    path.write_text("ap: 99\n", encoding="utf-8")
+    _backdate(path)
+    assert _load_cached(path, load_yaml) == {"ap": 99}
+
+
+def test_content_cache_sees_backdated_replacement(events_dir: Path):
+    before = _intros(events_dir)
+    path = events_dir / "cafe_noon.json"
+    path.write_text(path.read_text(encoding="utf-8").replace("咖啡香气", "茶香"), encoding="utf-8")
+    _backdate(path)
+    after = _intros(events_dir)
+    assert after != before
+    assert any(intro.startswith("茶香") for intro in after)
+
+
+def test_content_cache_sees_added_and_removed_files(events_dir: Path):
+    assert len(load_json_files(events_dir)) == 2
+    shutil.copy(events_dir / "cafe_noon.json", events_dir / "zz_copy.json")
+    _backdate(events_dir / "zz_copy.json", seconds=3600)
+    assert len(load_json_files(events_dir)) == 3
+    (events_dir / "park_morning.json").unlink()
+    assert [event["event_id"] for event in load_json_files(events_dir)] == ["cafe_noon_01", "cafe_noon_01"]
+
+
+@pytest.mark.parametrize(
+    "garbage",
+    [
+        b"",
+        b"not a pickle",
+        b"\x80\x06" + b"\x00" * 8,  # protocol newer than this interpreter supports
+        b"c__main__\nNope\n.",  # references a class that does not exist
+        b"\x80\x04\x95\x05\x00\x00\x00\x00\x00\x00\x00K\x01.",  # valid pickle, wrong payload shape
+    ],
+)
+def test_corrupt_cache_falls_back_to_parsing(tmp_path: Path, events_dir: Path, garbage: bytes):
+    path = tmp_path / "resources.yaml"
+    path.write_text("ap: 2\n", encoding="utf-8")
+    (tmp_path / "resources.yaml.pkl").write_bytes(garbage)
+    assert _load_cached(path, load_yaml) == {"ap": 2}
+
+    expected = _intros(events_dir)
+    (events_dir / ".bundle.pkl").write_bytes(garbage)
+    assert _intros(events_dir) == expected
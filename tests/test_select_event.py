@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import random
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional
+
+import pytest
+
+from app import orchestrator
+from app.content import ContentBundle, index_events_by_slot, index_hooks_by_location
+
+
+def _linear_select(events: List[Dict[str, Any]], last_event_id: Optional[str], seed: int) -> Dict[str, Any]:
+    # The original scan: halve every repeat of the last event, then walk the
+    # running total until it reaches the seeded threshold.
+    weights = []
+    for event in events:
+        weight = event.get("base_weight", 1.0)
+        if last_event_id and event.get("event_id") == last_event_id:
+            weight *= 0.5
+        weights.append(weight)
+    total = sum(weights)
+    if total <= 0:
+        return events[0]
+    threshold = (seed % 10_000) / 10_000 * total
+    cumulative = 0.0
+    for event, weight in zip(events, weights):
+        cumulative += weight
+        if cumulative >= threshold:
+            return event
+    return events[-1]
+
+
+def _at_slot(*events: Dict[str, Any]) -> List[Dict[str, Any]]:
+    return [{"location": "park", "time_slot": "morning", **event} for event in events]
+
+
+def _select(monkeypatch, events: List[Dict[str, Any]], last_event_id: Optional[str], seed: int) -> Dict[str, Any]:
+    content = ContentBundle(
+        events=events,
+        hooks=[],
+        endings=[],
+        events_by_slot=index_events_by_slot(events),
+        hooks_by_location=index_hooks_by_location([]),
+    )
+    state = SimpleNamespace(
+        session_id="session",
+        run_index=1,
+        day_index=1,
+        event_history=[last_event_id] if last_event_id else [],
+    )
+    monkeypatch.setattr(orchestrator, "stable_seed", lambda *parts: seed)
+    return orchestrator.select_event(content, "park", "morning", state)
+
+
+def _random_bucket(rng: random.Random) -> List[Dict[str, Any]]:
+    size = rng.randint(1, 10)
+    id_pool = [None] + [f"event_{index}" for index in range(rng.randint(1, size))]
+    weights = [0.0, 0.25, 0.5, 1.0, 2.0, 3.0, 0.3, 0.7, 1.1]
+    events = []
+    for position in range(size):
+        event: Dict[str, Any] = {"location": "park", "time_slot": "morning", "position": position}
+        event_id = rng.choice(id_pool)
+        if event_id is not None or rng.random() < 0.5:
+            event["event_id"] = event_id
+        if rng.random() < 0.8:
+            event["base_weight"] = rng.choice(weights)
+        events.append(event)
+    return events
+
+
+def test_matches_linear_scan_on_random_buckets(monkeypatch):
+    rng = random.Random(20261014)
+    for _ in range(20_000):
+        events = _random_bucket(rng)
+        ids = [event.get("event_id") for event in events]
+        last_event_id = rng.choice(ids + [None, "not_in_bucket"])
+        seed = rng.choice([0, 9_999, rng.getrandbits(64)])
+        expected = _linear_select(events, last_event_id, seed)
+        assert _select(monkeypatch, events, last_event_id, seed) is expected, (events, last_event_id, seed)
+
+
+@pytest.mark.parametrize("seed", [0, 2_500, 5_000, 9_999])
+def test_penalizes_every_repeat_of_the_last_event(monkeypatch, seed):
+    events = _at_slot(
+        {"event_id": "a", "base_weight": 1.0},
+        {"event_id": "b", "base_weight": 1.0},
+        {"event_id": "a", "base_weight": 1.0},
+        {"event_id": "c", "base_weight": 1.0},
+    )
+    assert _select(monkeypatch, events, "a", seed) is _linear_select(events, "a", seed)
+
+
+def test_all_zero_weights_pick_the_first_event(monkeypatch):
+    events = _at_slot({"event_id": "a", "base_weight": 0.0}, {"event_id": "b", "base_weight": 0.0})
+    assert _select(monkeypatch, events, "a", 1234) is events[0]
+
+
+def test_missing_slot_returns_none(monkeypatch):
+    events = [{"event_id": "a", "location": "cafe", "time_slot": "noon"}]
+    assert _select(monkeypatch, events, None, 0) is None
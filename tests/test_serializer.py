@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+import json
+from datetime import datetime
+from pathlib import Path
+from typing import List, Optional, Set, Tuple, Union
+
+import orjson
+import pytest
+from pydantic import BaseModel, Field, computed_field
+
+from app.config import load_config
+from app.content import load_content
+from app.models import ApiResponse, Resources
+from app.orchestrator import action_select, build_response, chat, create_initial_state, day_end, day_start
+from app.serializer import build_serializer, serialize_api_response
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def _simulated_responses(sessions: int, days: int):
+    config = load_config(ROOT)
+    content = load_content(ROOT)
+    for _ in range(sessions):
+        state = create_initial_state(config)
+        for _ in range(days):
+            yield build_response(state, day_start(state, config), [])
+            for location, time_slot in (("park", "morning"), ("cafe", "noon"), ("park", "morning")):
+                messages, ui_hints = action_select(state, content, location, time_slot)
+                yield build_response(state, messages, ui_hints)
+            yield build_response(state, chat(state, "你好", content), [])
+            yield build_response(state, day_end(state, config, content), [])
+
+
+def test_matches_model_dump_json():
+    count = 0
+    for response in _simulated_responses(sessions=30, days=40):
+        assert orjson.loads(orjson.dumps(serialize_api_response(response))) == json.loads(response.model_dump_json())
+        count += 1
+    assert count
+
+
+def test_round_trips_through_api_response():
+    response = next(_simulated_responses(sessions=1, days=1))
+    payload = orjson.loads(orjson.dumps(serialize_api_response(response)))
+    assert ApiResponse.model_validate(payload) == response
+
+
+def _make_inner(**fields):
+    # Separate classes that share the name "Inner", as two modules might define.
+    return type("Inner", (BaseModel,), {"__annotations__": fields})
+
+
+_InnerA = _make_inner(x=int)
+_InnerB = _make_inner(x=str, y=int)
+
+
+class _Outer(BaseModel):
+    a: _InnerA
+    b: _InnerB
+    c: List[_InnerA]
+
+
+def test_same_named_nested_models_get_separate_functions():
+    outer = _Outer(a=_InnerA(x=1), b=_InnerB(x="two", y=3), c=[_InnerA(x=4)])
+    assert build_serializer(_Outer)(outer) == json.loads(outer.model_dump_json())
+
+
+class _WithTuple(BaseModel):
+    value: Tuple[int, int]
+
+
+class _WithSet(BaseModel):
+    value: Set[str]
+
+
+class _WithDatetime(BaseModel):
+    value: datetime
+
+
+class _WithModelUnion(BaseModel):
+    value: Union[Resources, _WithTuple]
+
+
+class _WithAlias(BaseModel):
+    value: int = Field(alias="v")
+
+
+class _WithSerializationAlias(BaseModel):
+    value: int = Field(serialization_alias="v")
+
+
+class _WithExclude(BaseModel):
+    value: int = Field(exclude=True)
+
+
+class _WithComputed(BaseModel):
+    value: int
+
+    @computed_field
+    @property
+    def doubled(self) -> int:
+        return self.value * 2
+
+
+class _Nested(BaseModel):
+    items: List[Optional[_WithSet]]
+
+
+@pytest.mark.parametrize(
+    "model",
+    [
+        _WithTuple,
+        _WithSet,
+        _WithDatetime,
+        _WithModelUnion,
+        _WithAlias,
+        _WithSerializationAlias,
+        _WithExclude,
+        _WithComputed,
+        _Nested,
+    ],
+)
+def test_rejects_unsupported_schema(model):
+    with pytest.raises(TypeError):
+        build_serializer(model)